@@ -761,7 +761,7 @@ def section_build_publish(config: dict, custom_feed: str):
         st.markdown("#### 🚀 Publicação (Tenant Level)")
         st.info("ℹ️ Os pacotes serão publicados no Tenant, ficando disponíveis para todas as pastas (Modern Folders).")
         
-        orch_service = OrchestratorService(config)
+        orch_service = OrchestratorService.get(config)
         pm = PackageManager()
         
         packages_dir = st.text_input("Diretório de Pacotes", value=config["default_output_dir"], key="pub_dir")
@@ -824,7 +824,7 @@ def section_build_publish(config: dict, custom_feed: str):
         st.markdown("#### 📚 Gerenciamento de Libraries")
         st.info("ℹ️ Baixe libraries do Orchestrator para o cache local NuGet. Isso resolve problemas de autenticação durante o build.")
         
-        orch_service = OrchestratorService(config)
+        orch_service = OrchestratorService.get(config)
         
         # Search and list libraries
         col_search, col_btn = st.columns([3, 1])
@@ -1112,7 +1112,7 @@ def section_build_publish(config: dict, custom_feed: str):
                                                 # Resolve best version (for display/primary)
                                                 first_spec = next(iter(dep_info.version_specs))
                                                 dep_info.resolved_version = resolve_best_version(
-                                                    available_versions, first_spec
+                                                    available_versions, first_spec, dep_info=dep_info
                                                 )
                                                 
                                                 # Resolve ALL unique versions needed across projects
@@ -1281,7 +1281,7 @@ def section_tenant_migration(config: dict):
     st.markdown('<p class="section-header">🔄 Tenant Migration</p>', unsafe_allow_html=True)
     st.info("ℹ️ Migração simplificada usando os novos serviços.")
     
-    orch = OrchestratorService(config)
+    orch = OrchestratorService.get(config)
     
     c1, c2 = st.columns(2)
     source_tenant = c1.text_input("Tenant Origem", value=config["orch_tenant"])
@@ -8,12 +8,18 @@ This ensures that when a custom library declares dependencies (e.g., .Runtime pa
 those dependencies are also downloaded and installed to the local NuGet cache.
 """
 
+import io
 import os
 import re
+import itertools
 import zipfile
-from typing import List, Dict, Set, Tuple, Optional, TYPE_CHECKING
+import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Tuple, Optional, TYPE_CHECKING
 from dataclasses import dataclass, field
 
+from services.dependency_scanner import get_nuget_cache_path
+
 if TYPE_CHECKING:
     from services.orchestrator import OrchestratorService
 
@@ -28,7 +34,28 @@ OFFICIAL_PREFIXES = [
 ]
 
 
-@dataclass
+class _AtomicCounter:
+    """
+    Increment-only counter that is safe to share across worker threads.
+
+    itertools.count advances in C, so next() is atomic under the GIL —
+    no lock is needed on the hot resolve path.
+    """
+    __slots__ = ('_counter',)
+
+    def __init__(self):
+        self._counter = itertools.count()
+
+    def increment(self):
+        next(self._counter)
+
+    @property
+    def value(self) -> int:
+        # Peek at the current value without consuming it
+        return self._counter.__reduce__()[1][0]
+
+
+@dataclass(slots=True)
 class ResolvedPackage:
     """A resolved package with its transitive dependencies."""
     package_id: str
@@ -41,6 +68,17 @@ class ResolvedPackage:
     error: Optional[str] = None
 
 
+@dataclass(slots=True)
+class _ResolveResult:
+    """
+    Cached outcome of resolving one (package, version), stored in the
+    visited Future so duplicate callers reuse both the resolved package and
+    its parsed dependency list without reopening the zip.
+    """
+    pkg: ResolvedPackage
+    deps: List[Dict[str, str]] = field(default_factory=list)
+
+
 class DependencyResolver:
     """
     Resolves transitive dependencies for UiPath custom libraries.
@@ -60,72 +98,107 @@ class DependencyResolver:
             orchestrator_service: Service for downloading packages from Orchestrator
         """
         self.orch = orchestrator_service
-        self._visited: Set[Tuple[str, str]] = set()
+        # Maps (package_id_lower, version) -> Future[ResolvedPackage].
+        # dict.setdefault is atomic under the GIL, so concurrent workers
+        # dedupe per-key without a lock: the first caller owns the Future,
+        # later callers reuse (or await) its result.
+        self._visited: Dict[Tuple[str, str], Future] = {}
         self._download_stats = {
-            "downloaded": 0,
-            "installed": 0,
-            "skipped": 0,
-            "failed": 0
+            "downloaded": _AtomicCounter(),
+            "installed": _AtomicCounter(),
+            "skipped": _AtomicCounter(),
+            "failed": _AtomicCounter()
         }
-    
+
     def reset_stats(self):
         """Reset download statistics."""
         self._visited.clear()
         self._download_stats = {
-            "downloaded": 0,
-            "installed": 0,
-            "skipped": 0,
-            "failed": 0
+            "downloaded": _AtomicCounter(),
+            "installed": _AtomicCounter(),
+            "skipped": _AtomicCounter(),
+            "failed": _AtomicCounter()
         }
-    
+
     def get_stats(self) -> Dict[str, int]:
         """Get current download statistics."""
-        return self._download_stats.copy()
+        return {name: counter.value for name, counter in self._download_stats.items()}
     
-    def parse_nuspec_dependencies(self, nupkg_path: str) -> List[Dict[str, str]]:
+    def parse_nuspec_dependencies(self, nupkg_source) -> List[Dict[str, str]]:
         """
         Parse .nuspec file inside a .nupkg to extract dependencies.
-        
+
+        Uses ElementTree.iterparse on the streamed zip entry so attribute
+        order doesn't matter and dependencies nested inside
+        <group targetFramework="..."> elements are also captured.
+
         Args:
-            nupkg_path: Path to the .nupkg file
-            
+            nupkg_source: Path to the .nupkg file, or a seekable buffer
+                with the package bytes (avoids re-reading from disk)
+
         Returns:
             List of dicts with 'id' and 'version' keys for each dependency
         """
         dependencies = []
-        
+        display_name = (
+            os.path.basename(nupkg_source) if isinstance(nupkg_source, str) else "<buffer>"
+        )
+
         try:
-            with zipfile.ZipFile(nupkg_path, 'r') as zf:
+            with zipfile.ZipFile(nupkg_source, 'r') as zf:
                 # Find .nuspec file
                 nuspec_files = [f for f in zf.namelist() if f.endswith('.nuspec')]
                 if not nuspec_files:
-                    print(f"Warning: No .nuspec found in {nupkg_path}")
+                    print(f"Warning: No .nuspec found in {display_name}")
                     return []
-                
-                content = zf.read(nuspec_files[0]).decode('utf-8')
-                
-                # Parse dependency elements
-                # Pattern matches: <dependency id="..." version="..." />
-                # Also handles: <dependency id="..." version="..." ... />
-                pattern = r'<dependency\s+id=["\']([^"\']+)["\']\s+version=["\']([^"\']+)["\']'
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                
-                for pkg_id, version_spec in matches:
-                    resolved_version = self._resolve_version_spec(version_spec)
+
+                with zf.open(nuspec_files[0]) as raw:
+                    dependencies = self._parse_nuspec_stream(raw)
+
+                if dependencies:
+                    print(f"  Found {len(dependencies)} dependencies in {display_name}")
+
+        except zipfile.BadZipFile:
+            print(f"Error: {display_name} is not a valid zip/nupkg file")
+        except ET.ParseError as e:
+            print(f"Error parsing nuspec XML from {display_name}: {e}")
+        except Exception as e:
+            print(f"Error parsing nuspec from {display_name}: {e}")
+
+        return dependencies
+
+    def parse_nuspec_file(self, nuspec_path: str) -> List[Dict[str, str]]:
+        """
+        Parse dependencies from a bare .nuspec file on disk.
+
+        Used when the package is already extracted in the local NuGet cache,
+        so the .nupkg never needs to be reopened.
+        """
+        try:
+            with open(nuspec_path, 'rb') as raw:
+                return self._parse_nuspec_stream(raw)
+        except (OSError, ET.ParseError) as e:
+            print(f"Error parsing nuspec {nuspec_path}: {e}")
+            return []
+
+    def _parse_nuspec_stream(self, raw) -> List[Dict[str, str]]:
+        """Extract dependency entries from an open nuspec byte stream."""
+        dependencies = []
+        for event, elem in ET.iterparse(raw, events=('start',)):
+            # Namespace-agnostic tag name (nuspecs declare a
+            # schemas.microsoft.com/packaging/... xmlns)
+            tag = elem.tag.rpartition('}')[2]
+            if tag == 'dependency':
+                pkg_id = elem.get('id')
+                version_spec = elem.get('version')
+                if pkg_id and version_spec:
                     dependencies.append({
                         'id': pkg_id,
-                        'version': resolved_version,
+                        'version': self._resolve_version_spec(version_spec),
                         'version_spec': version_spec  # Keep original for reference
                     })
-                    
-                if dependencies:
-                    print(f"  Found {len(dependencies)} dependencies in {os.path.basename(nupkg_path)}")
-                    
-        except zipfile.BadZipFile:
-            print(f"Error: {nupkg_path} is not a valid zip/nupkg file")
-        except Exception as e:
-            print(f"Error parsing nuspec from {nupkg_path}: {e}")
-        
+            # Keep peak memory bounded during the incremental parse
+            elem.clear()
         return dependencies
 
     def resolve_all(
@@ -157,7 +230,14 @@ class DependencyResolver:
         """
         self.reset_stats()
         os.makedirs(target_dir, exist_ok=True)
-        
+
+        # Fan out the metadata lookups before downloading anything, so the
+        # per-package existence checks below are cache hits
+        if version_cache is not None:
+            self.prewarm_version_cache(
+                token, {pkg_id for pkg_id, _ in root_packages}, version_cache
+            )
+
         resolved = []
         errors = []
         
@@ -174,16 +254,49 @@ class DependencyResolver:
             resolved.append(result)
             errors.extend(errs)
         
+        stats = self.get_stats()
         print(f"\n{'='*60}")
         print(f"Resolution complete!")
-        print(f"  Downloaded: {self._download_stats['downloaded']}")
-        print(f"  Installed:  {self._download_stats['installed']}")
-        print(f"  Skipped:    {self._download_stats['skipped']}")
-        print(f"  Failed:     {self._download_stats['failed']}")
+        print(f"  Downloaded: {stats['downloaded']}")
+        print(f"  Installed:  {stats['installed']}")
+        print(f"  Skipped:    {stats['skipped']}")
+        print(f"  Failed:     {stats['failed']}")
         print(f"{'='*60}\n")
         
         return resolved, errors
 
+    def prewarm_version_cache(
+        self,
+        token: str,
+        package_ids,
+        version_cache: Dict,
+        max_workers: int = 16
+    ):
+        """
+        Populate the version cache for a batch of package ids concurrently.
+
+        One metadata round-trip per package at ~hundreds of ms each adds up
+        fast when done serially; fanning them out over a thread pool cuts
+        the wall time to roughly a single round-trip. version_cache writes
+        are per-key dict inserts, which are safe under the GIL.
+
+        Args:
+            token: Orchestrator auth token
+            package_ids: Iterable of package ids to look up
+            version_cache: Dict shared with check_library_exists
+            max_workers: Upper bound on concurrent lookups
+        """
+        pending = [pid for pid in set(package_ids) if pid not in version_cache]
+        if not pending:
+            return
+
+        workers = min(max_workers, len(pending))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(
+                lambda pid: self.orch.check_library_exists(token, pid, version_cache),
+                pending
+            ))
+
     def _resolve_recursive(
         self,
         token: str,
@@ -209,17 +322,66 @@ class DependencyResolver:
         """
         errors = []
         pkg = ResolvedPackage(package_id=package_id, version=version)
-        
-        # Check if already visited (avoid loops and duplicates)
+
+        # Check if already visited (avoid loops and duplicates).
+        # setdefault both claims the key and detects in-flight duplicates:
+        # if another branch/worker owns the Future, reuse its outcome.
         key = (package_id.lower(), version)
-        if key in self._visited:
+        fut = Future()
+        prev = self._visited.setdefault(key, fut)
+        if prev is not fut:
             print(f"  ⏭️  Already processed: {package_id}@{version}")
+            if prev.done():
+                # Completed elsewhere: mirror its outcome without re-reading
+                # the nupkg. A not-done Future means the package is still on
+                # the current call stack (a dependency cycle) — just skip.
+                cached = prev.result()
+                pkg.nupkg_path = cached.pkg.nupkg_path
+                pkg.is_installed = cached.pkg.is_installed
             pkg.is_downloaded = True
             pkg.was_skipped = True
             return pkg, errors
-        
-        self._visited.add(key)
-        
+
+        res = _ResolveResult(pkg=pkg)
+        try:
+            return self._do_resolve(
+                res, token, package_id, version, target_dir, install_to_cache, version_cache
+            )
+        finally:
+            fut.set_result(res)
+
+    def _do_resolve(
+        self,
+        res: _ResolveResult,
+        token: str,
+        package_id: str,
+        version: str,
+        target_dir: str,
+        install_to_cache: bool,
+        version_cache: Optional[Dict] = None
+    ) -> Tuple[ResolvedPackage, List[str]]:
+        """Body of _resolve_recursive after the visited-map claim."""
+        pkg = res.pkg
+        errors = []
+
+        # Fast path: the exact (package, version) is already extracted in the
+        # local NuGet cache. Read the .nuspec straight from the cache and
+        # recurse into dependencies without touching the network or the zip.
+        if install_to_cache:
+            cached_nuspec = self._find_cached_nuspec(package_id, version)
+            if cached_nuspec:
+                print(f"  ⚡ Local NuGet cache hit: {package_id}@{version}")
+                pkg.is_downloaded = True
+                pkg.is_installed = True
+                pkg.was_skipped = True
+                self._download_stats['skipped'].increment()
+                dependencies = res.deps = self.parse_nuspec_file(cached_nuspec)
+                self._resolve_dependencies(
+                    pkg, dependencies, errors,
+                    token, target_dir, install_to_cache, version_cache
+                )
+                return pkg, errors
+
         # Check if package is available (if we have version cache)
         if version_cache is not None:
             if package_id not in version_cache:
@@ -227,65 +389,145 @@ class DependencyResolver:
                 if not exists:
                     pkg.error = f"Package not found in Orchestrator"
                     errors.append(f"{package_id}@{version}: Not found in Orchestrator")
-                    self._download_stats['failed'] += 1
+                    self._download_stats['failed'].increment()
                     return pkg, errors
         
-        # Download the package
-        success, result = self.orch.download_library_persistent(
-            token, package_id, version, target_dir, skip_existing=True
-        )
-        
+        # Download the package, teeing the stream into an in-memory buffer
+        # so the install and nuspec parse below reuse the same bytes instead
+        # of re-reading the file from disk (three passes fused into one).
+        success, result, buf = self._fetch_package(token, package_id, version, target_dir)
+
         if not success:
             pkg.error = result
             errors.append(f"{package_id}@{version}: {result}")
-            self._download_stats['failed'] += 1
+            self._download_stats['failed'].increment()
             return pkg, errors
-        
+
         pkg.nupkg_path = result
         pkg.is_downloaded = True
-        
-        # Check if file was already there or newly downloaded
-        # We can detect this by checking if download was very fast (file existed)
-        expected_path = os.path.join(target_dir, f"{package_id}.{version}.nupkg")
-        if result == expected_path:
-            print(f"  ✅ Downloaded: {package_id}@{version}")
-            self._download_stats['downloaded'] += 1
+
+        if buf is None:
+            # File was already on disk; no network transfer happened
+            print(f"  ⏭️  Already on disk: {package_id}@{version}")
+            pkg.was_skipped = True
+            self._download_stats['skipped'].increment()
         else:
-            self._download_stats['downloaded'] += 1
-        
+            print(f"  ✅ Downloaded: {package_id}@{version}")
+            self._download_stats['downloaded'].increment()
+
         # Install to cache if requested
         if install_to_cache:
-            inst_ok, inst_msg = self.orch.install_nupkg_to_cache(result)
+            inst_ok, inst_msg = self.orch.install_nupkg_to_cache(result, data=buf)
             pkg.is_installed = inst_ok
             if inst_ok:
                 print(f"  📥 Installed to cache: {package_id}@{version}")
-                self._download_stats['installed'] += 1
+                self._download_stats['installed'].increment()
             else:
                 print(f"  ⚠️  Install failed: {inst_msg}")
                 errors.append(f"Install failed {package_id}: {inst_msg}")
-        
-        # Parse dependencies from .nuspec
-        dependencies = self.parse_nuspec_dependencies(result)
-        
+
+        # Parse dependencies from .nuspec (reuse the buffer when we have one)
+        dependencies = res.deps = self.parse_nuspec_dependencies(buf if buf is not None else result)
+        self._resolve_dependencies(
+            pkg, dependencies, errors,
+            token, target_dir, install_to_cache, version_cache
+        )
+
+        return pkg, errors
+
+    def _resolve_dependencies(
+        self,
+        pkg: ResolvedPackage,
+        dependencies: List[Dict[str, str]],
+        errors: List[str],
+        token: str,
+        target_dir: str,
+        install_to_cache: bool,
+        version_cache: Optional[Dict] = None
+    ):
+        """Recurse into a package's parsed dependency list."""
         for dep in dependencies:
             dep_id = dep['id']
             dep_version = dep['version']
-            
+
             # Skip official UiPath/System packages
             if self._is_official_package(dep_id):
                 print(f"  ⏭️  Skipping official package: {dep_id}")
                 continue
-            
+
             print(f"  🔗 Resolving dependency: {dep_id}@{dep_version}")
-            
+
             # Resolve dependency recursively
             dep_pkg, dep_errs = self._resolve_recursive(
                 token, dep_id, dep_version, target_dir, install_to_cache, version_cache
             )
             pkg.dependencies.append(dep_pkg)
             errors.extend(dep_errs)
-        
-        return pkg, errors
+
+    def _fetch_package(
+        self,
+        token: str,
+        package_id: str,
+        version: str,
+        target_dir: str
+    ) -> Tuple[bool, str, Optional[io.BytesIO]]:
+        """
+        Download a package, streaming to disk while teeing into memory.
+
+        Returns (success, path_or_error, buffer). The buffer holds the full
+        package bytes for reuse by the install and nuspec-parse steps; it is
+        None when the file already existed on disk and nothing was fetched.
+        """
+        filename = f"{package_id}.{version}.nupkg"
+        target_path = os.path.join(target_dir, filename)
+
+        # Skip the network entirely if a valid file is already there
+        if os.path.exists(target_path) and os.path.getsize(target_path) > 1000:
+            return True, target_path, None
+
+        success, stream = self.orch.download_library_stream(token, package_id, version)
+        if not success:
+            return False, stream, None
+
+        buf = io.BytesIO()
+        try:
+            with open(target_path, 'wb') as f:
+                for chunk in stream:
+                    f.write(chunk)
+                    buf.write(chunk)
+        except Exception as e:
+            # Drop the partial file, or the skip-existing check above
+            # would treat it as a completed download on the next run
+            try:
+                os.remove(target_path)
+            except OSError:
+                pass
+            return False, f"❌ Erro ao baixar library: {e}", None
+
+        # Verify it's a valid file (not HTML error page)
+        if buf.tell() <= 1000:
+            os.remove(target_path)
+            return False, "Downloaded file too small, likely not a valid package", None
+
+        buf.seek(0)
+        return True, target_path, buf
+
+    def _find_cached_nuspec(self, package_id: str, version: str) -> Optional[str]:
+        """
+        Locate the .nuspec for an already-installed (package, version) in the
+        local NuGet cache, or None if the package isn't installed.
+        """
+        version_dir = os.path.join(
+            get_nuget_cache_path(), package_id.lower(), version
+        )
+        try:
+            with os.scandir(version_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.nuspec') and entry.is_file():
+                        return entry.path
+        except OSError:
+            return None
+        return None
 
     def _is_official_package(self, package_id: str) -> bool:
         """
@@ -9,12 +9,22 @@ allowing for synchronized download and installation.
 
 import os
 import re
+import sys
 import json
+import bisect
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Set, Optional
 from dataclasses import dataclass, field
 
+try:
+    # C/SIMD-accelerated JSON parser; several times faster than stdlib json
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+@dataclass(slots=True)
 class DependencyInfo:
     """Information about a consolidated dependency across projects."""
     package_id: str
@@ -34,14 +44,56 @@ class DependencyInfo:
     error_message: Optional[str] = None
 
 
-# Default prefixes for official UiPath packages (to be excluded from custom libs)
-OFFICIAL_PREFIXES = [
+# Default prefixes for official UiPath packages (to be excluded from custom
+# libs). A tuple so str.startswith can test all of them in one C call.
+OFFICIAL_PREFIXES = (
     "UiPath.",
     "System.",
     "Microsoft.",
     "Newtonsoft.",
     "NuGet.",
-]
+)
+
+# Compiled once: the regex engine runs the whole prefix alternation in C,
+# replacing a Python-level any()+startswith loop per package
+_OFFICIAL_RE = re.compile('|'.join(re.escape(p) for p in OFFICIAL_PREFIXES))
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_prefix_matcher(prefixes: Tuple[str, ...]):
+    """Compile (and cache) a prefix-alternation matcher for custom prefixes."""
+    return re.compile('|'.join(re.escape(p) for p in prefixes))
+
+
+# Version-spec patterns, compiled once instead of per parse_version_spec call
+_EXACT_RE = re.compile(r'^\[(\d+\.\d+\.\d+(?:\.\d+)?(?:-[\w\.]+)?)\]$')
+_SIMPLE_RE = re.compile(r'^(\d+\.\d+\.\d+(?:\.\d+)?(?:-[\w\.]+)?)$')
+_LOWER_BOUND_RE = re.compile(r'^\[(\d+\.\d+\.\d+(?:\.\d+)?)')
+_UPPER_BOUND_RE = re.compile(r'^\(,\s*(\d+\.\d+\.\d+(?:\.\d+)?)')
+
+
+def _load_project_json(candidate: Tuple[str, str]) -> Tuple[str, Optional[dict]]:
+    """
+    Read and parse one project.json for the scanner's thread pool.
+
+    Returns (fallback_name, parsed_dict), with None for folders that have
+    no project.json or an unparseable one.
+    """
+    fallback_name, project_json_path = candidate
+    try:
+        if orjson is not None:
+            with open(project_json_path, 'rb') as f:
+                return fallback_name, orjson.loads(f.read())
+        with open(project_json_path, 'r', encoding='utf-8') as f:
+            return fallback_name, json.load(f)
+    except FileNotFoundError:
+        # Not a UiPath project folder
+        return fallback_name, None
+    except (ValueError, IOError) as e:
+        # Skip invalid project.json files (orjson and stdlib json both
+        # raise ValueError subclasses on decode errors)
+        print(f"Warning: Could not parse {project_json_path}: {e}")
+        return fallback_name, None
 
 
 def scan_project_dependencies(base_dir: str) -> Dict[str, DependencyInfo]:
@@ -60,42 +112,59 @@ def scan_project_dependencies(base_dir: str) -> Dict[str, DependencyInfo]:
         return dependencies
     
     try:
-        # Iterate over immediate subdirectories
-        for item in os.listdir(base_dir):
-            item_path = os.path.join(base_dir, item)
-            
-            if os.path.isdir(item_path):
-                project_json_path = os.path.join(item_path, "project.json")
-                
-                if os.path.exists(project_json_path):
-                    try:
-                        with open(project_json_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        
-                        project_name = data.get("name", item)
-                        deps = data.get("dependencies", {})
-                        
-                        # Process each dependency
-                        for pkg_id, version_spec in deps.items():
-                            if pkg_id not in dependencies:
-                                dependencies[pkg_id] = DependencyInfo(package_id=pkg_id)
-                            
-                            dependencies[pkg_id].version_specs.add(str(version_spec))
-                            dependencies[pkg_id].projects.add(project_name)
-                            # Track which project uses which version
-                            dependencies[pkg_id].project_versions[project_name] = str(version_spec)
-                            
-                    except (json.JSONDecodeError, IOError) as e:
-                        # Skip invalid project.json files
-                        print(f"Warning: Could not parse {project_json_path}: {e}")
+        # Collect candidate subdirectories first. scandir yields DirEntry
+        # objects with a cached stat, so is_dir() costs no extra syscall.
+        with os.scandir(base_dir) as it:
+            candidates = [
+                (entry.name, os.path.join(entry.path, "project.json"))
+                for entry in it
+                if entry.is_dir(follow_symlinks=False)
+            ]
+
+        if candidates:
+            # The reads are I/O-bound: overlap them across a thread pool.
+            # Merging into the shared dict stays serial on the main thread.
+            with ThreadPoolExecutor(max_workers=min(32, len(candidates))) as ex:
+                results = ex.map(_load_project_json, candidates)
+
+                for fallback_name, data in results:
+                    if data is None:
                         continue
-                        
+
+                    project_name = data.get("name", fallback_name)
+                    deps = data.get("dependencies", {})
+
+                    # Process each dependency. Version specs and project
+                    # names repeat heavily across projects, so intern them
+                    # to share one string object per distinct value.
+                    project_name = sys.intern(project_name)
+                    for pkg_id, version_spec in deps.items():
+                        pkg_id = sys.intern(pkg_id)
+                        spec = sys.intern(str(version_spec))
+                        # Single hash lookup per dependency; the default is
+                        # only constructed on a miss
+                        info = dependencies.get(pkg_id)
+                        if info is None:
+                            info = dependencies[pkg_id] = DependencyInfo(package_id=pkg_id)
+
+                        info.version_specs.add(spec)
+                        info.projects.add(project_name)
+                        # Track which project uses which version
+                        info.project_versions[project_name] = spec
+
     except Exception as e:
         print(f"Error scanning dependencies: {e}")
-    
+
+    # Scan is done building: freeze the sets so downstream consumers share
+    # immutable objects (frozenset hashing/copy hit the identity fast path)
+    for info in dependencies.values():
+        info.version_specs = frozenset(info.version_specs)
+        info.projects = frozenset(info.projects)
+
     return dependencies
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_version_spec(version_spec: str) -> Tuple[str, Optional[str]]:
     """
     Parse UiPath/NuGet version specification string.
@@ -116,27 +185,23 @@ def parse_version_spec(version_spec: str) -> Tuple[str, Optional[str]]:
         extracted_version: The version number if exact/minimum, None for ranges
     """
     spec = str(version_spec).strip()
-    
+
     # Exact version: [X.Y.Z]
-    exact_match = re.match(r'^\[(\d+\.\d+\.\d+(?:\.\d+)?(?:-[\w\.]+)?)\]$', spec)
-    if exact_match:
-        return ('exact', exact_match.group(1))
-    
+    if (m := _EXACT_RE.match(spec)):
+        return ('exact', m.group(1))
+
     # Simple version (no brackets) - treat as minimum/exact
-    simple_match = re.match(r'^(\d+\.\d+\.\d+(?:\.\d+)?(?:-[\w\.]+)?)$', spec)
-    if simple_match:
-        return ('minimum', simple_match.group(1))
-    
+    if (m := _SIMPLE_RE.match(spec)):
+        return ('minimum', m.group(1))
+
     # Range with lower bound: [X.Y.Z, ...
-    lower_bound_match = re.match(r'^\[(\d+\.\d+\.\d+(?:\.\d+)?)', spec)
-    if lower_bound_match:
-        return ('range', lower_bound_match.group(1))
-    
+    if (m := _LOWER_BOUND_RE.match(spec)):
+        return ('range', m.group(1))
+
     # Range with upper bound only: (,X.Y.Z] or (,X.Y.Z)
-    upper_bound_match = re.match(r'^\(,\s*(\d+\.\d+\.\d+(?:\.\d+)?)', spec)
-    if upper_bound_match:
+    if _UPPER_BOUND_RE.match(spec):
         return ('range', None)
-    
+
     return ('unknown', None)
 
 
@@ -156,15 +221,16 @@ def is_custom_library(
     Returns:
         True if package is considered a custom library
     """
-    if official_prefixes is None:
-        official_prefixes = OFFICIAL_PREFIXES
-    
-    # If custom prefixes are provided, use whitelist approach
+    # If custom prefixes are provided, use whitelist approach. The
+    # compiled alternation runs in C with shared-prefix matching and is
+    # memoized per prefix tuple.
     if custom_prefixes:
-        return any(package_id.startswith(prefix) for prefix in custom_prefixes)
-    
+        return _compile_prefix_matcher(tuple(custom_prefixes)).match(package_id) is not None
+
     # Otherwise, use blacklist approach (exclude official packages)
-    return not any(package_id.startswith(prefix) for prefix in official_prefixes)
+    if official_prefixes is None:
+        return _OFFICIAL_RE.match(package_id) is None
+    return _compile_prefix_matcher(tuple(official_prefixes)).match(package_id) is None
 
 
 def filter_custom_dependencies(
@@ -186,91 +252,131 @@ def filter_custom_dependencies(
     if not use_prefix_filter:
         # No filtering - return all
         return dependencies
-    
+
+    if custom_prefixes:
+        # Whitelist: keep only packages matching a custom prefix
+        match = _compile_prefix_matcher(tuple(custom_prefixes)).match
+        return {
+            pkg_id: info
+            for pkg_id, info in dependencies.items()
+            if match(pkg_id)
+        }
+
+    # Blacklist: drop official packages
+    match = _OFFICIAL_RE.match
     return {
-        pkg_id: info 
-        for pkg_id, info in dependencies.items() 
-        if is_custom_library(pkg_id, custom_prefixes if use_prefix_filter else None)
+        pkg_id: info
+        for pkg_id, info in dependencies.items()
+        if not match(pkg_id)
     }
 
 
 def resolve_best_version(
-    available_versions: List[str], 
-    version_spec: str
+    available_versions: List[str],
+    version_spec: str,
+    dep_info: Optional[DependencyInfo] = None
 ) -> Optional[str]:
     """
     Given available versions and a version spec, find the best matching version.
-    
+
     Strategy:
     1. If exact version specified and available, use it
     2. If minimum version specified, find highest version >= minimum
     3. For ranges, try to satisfy bounds
     4. Fallback: return latest (first in sorted desc list)
-    
+
     Args:
         available_versions: List of available versions (should be sorted descending)
         version_spec: The version specification from project.json
-        
+        dep_info: Optional DependencyInfo; when it already carries a
+            resolved_version, that answer is returned without re-scanning
+
     Returns:
         Best matching version or None if no versions available
     """
+    if dep_info is not None and dep_info.resolved_version:
+        return dep_info.resolved_version
+
     if not available_versions:
         return None
-    
+
     spec_type, extracted = parse_version_spec(version_spec)
     
     if spec_type == 'exact' and extracted:
         # Exact match required
         if extracted in available_versions:
             return extracted
-        # Try to find close match (ignore build metadata differences)
+        # Close match ignoring build metadata: O(1) lookup in the cached
+        # base-version index instead of scanning the whole list
         base_version = extracted.split('-')[0]
+        hit = _base_version_index(tuple(available_versions)).get(base_version)
+        if hit:
+            return hit
+        # Prefix fallback for partial bases (e.g. spec "1.0" vs "1.0.5")
         for v in available_versions:
-            if v == extracted or v.startswith(base_version):
+            if v.startswith(base_version):
                 return v
-    
+
     if spec_type == 'minimum' and extracted:
-        # Find highest version >= minimum
+        # Find highest version >= minimum via binary search on the
+        # (cached) ascending normalized keys instead of a linear scan
         try:
-            for v in available_versions:  # Already sorted desc
-                if compare_versions(v, extracted) >= 0:
-                    return v
+            ascending = _normalized_ascending(tuple(available_versions))
+            idx = bisect.bisect_left(ascending, _normalize_version(extracted))
+            if idx < len(ascending):
+                # At least one version satisfies the minimum; the highest
+                # is the head of the descending input list
+                return available_versions[0]
         except Exception:
             pass
-    
+
     # Fallback: return latest version
     return available_versions[0] if available_versions else None
 
 
+@functools.lru_cache(maxsize=1024)
+def _base_version_index(versions: Tuple[str, ...]) -> Dict[str, str]:
+    """Map base version -> first (highest) full version, cached per list."""
+    index: Dict[str, str] = {}
+    for v in versions:
+        index.setdefault(v.split('-')[0], v)
+    return index
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalized_ascending(versions: Tuple[str, ...]) -> List[Tuple[int, ...]]:
+    """Ascending normalized keys for a descending version list (cached)."""
+    return [_normalize_version(v) for v in reversed(versions)]
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_version(v: str) -> Tuple[int, ...]:
+    """Normalize a version string to a comparable tuple of integers."""
+    # Remove pre-release suffix for comparison
+    base = v.split('-')[0]
+    return tuple(int(p) if p.isdigit() else 0 for p in base.split('.'))
+
+
+@functools.lru_cache(maxsize=4096)
 def compare_versions(v1: str, v2: str) -> int:
     """
     Compare two version strings.
-    
+
     Returns:
         -1 if v1 < v2
          0 if v1 == v2
          1 if v1 > v2
     """
-    def normalize(v):
-        # Remove pre-release suffix for comparison
-        base = v.split('-')[0]
-        parts = base.split('.')
-        return [int(p) if p.isdigit() else 0 for p in parts]
-    
-    n1 = normalize(v1)
-    n2 = normalize(v2)
-    
-    # Pad to same length
+    n1 = _normalize_version(v1)
+    n2 = _normalize_version(v2)
+
+    # Pad to same length so "1.0" == "1.0.0"
     max_len = max(len(n1), len(n2))
-    n1.extend([0] * (max_len - len(n1)))
-    n2.extend([0] * (max_len - len(n2)))
-    
-    for a, b in zip(n1, n2):
-        if a < b:
-            return -1
-        if a > b:
-            return 1
-    return 0
+    n1 = n1 + (0,) * (max_len - len(n1))
+    n2 = n2 + (0,) * (max_len - len(n2))
+
+    # Tuples compare lexicographically in C; no element-wise Python loop
+    return (n1 > n2) - (n1 < n2)
 
 
 def get_display_version(dep_info: DependencyInfo) -> str:
@@ -319,9 +425,13 @@ def resolve_all_versions_for_package(
     """
     if not available_versions:
         return []
-    
+
+    # Warm the normalized-key cache once for this dependency; every spec
+    # below then resolves against the same cached entry
+    _normalized_ascending(tuple(available_versions))
+
     resolved_set = set()
-    
+
     for version_spec in dep_info.version_specs:
         resolved = resolve_best_version(available_versions, version_spec)
         if resolved:
@@ -371,19 +481,21 @@ def get_download_list(
     Returns:
         Tuple of (to_download, already_exists) where each is a list of (pkg_id, version)
     """
-    all_versions = []
-    
+    # Build via a set so the same (pkg, version) never downloads twice
+    pending = set()
+
     for pkg_id, dep_info in custom_deps.items():
         if dep_info.exists_in_orchestrator and dep_info.all_resolved_versions:
             for version in dep_info.all_resolved_versions:
-                all_versions.append((pkg_id, version))
-    
-    # Check which already exist
-    existence = check_files_exist_in_directory(all_versions, target_dir)
-    
-    to_download = [pv for pv in all_versions if not existence.get(pv, False)]
-    already_exists = [pv for pv in all_versions if existence.get(pv, False)]
-    
+                pending.add((pkg_id, version))
+
+    # Check which already exist, partitioning in a single pass
+    existence = check_files_exist_in_directory(pending, target_dir)
+
+    to_download, already_exists = [], []
+    for pv in pending:
+        (already_exists if existence.get(pv, False) else to_download).append(pv)
+
     return to_download, already_exists
 
 
@@ -1,18 +1,44 @@
+import sys
 import streamlit as st
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from github import Github, GithubException
-from typing import List, Optional, Dict
-from datetime import datetime
+from typing import List, Optional, Dict, Tuple
+from datetime import datetime, timedelta, timezone
+
+# Updated-at cutoffs (in days) used to shard the org-wide PR search into
+# independent windows that can be paged in parallel
+_SEARCH_WINDOW_DAYS = (7, 14, 30, 60, 120, 240, 365)
+
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts the trailing Z directly on 3.11+
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(dt_str: str) -> datetime:
+        return datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
 
 class GithubService:
     """GitHub service with GraphQL support for optimized PR fetching."""
-    
+
     GRAPHQL_ENDPOINT = "https://api.github.com/graphql"
-    
+
     def __init__(self, token: str):
         self.token = token
         self.client = Github(token) if token else None
 
+        # Persistent session: connection pool + TLS keep-alive across all
+        # GraphQL pages instead of a fresh handshake per request
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=3)
+        )
+        if token:
+            self._session.headers.update({
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            })
+
     def is_authenticated(self) -> bool:
         return self.client is not None
 
@@ -20,119 +46,172 @@ class GithubService:
     # GRAPHQL API - Optimized for performance
     # =========================================
     
+    # GraphQL query to search for open PRs in the organization. Only the
+    # fields the list view renders; mergeable is dropped because it forces
+    # server-side merge checks (historically slow) and nothing displays it.
+    _SEARCH_QUERY = """
+    query($searchQuery: String!, $cursor: String) {
+      search(query: $searchQuery, type: ISSUE, first: 100, after: $cursor) {
+        issueCount
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          ... on PullRequest {
+            number
+            title
+            url
+            isDraft
+            createdAt
+            updatedAt
+            headRefName
+            baseRefName
+            labels(first: 10) {
+              nodes {
+                name
+              }
+            }
+            author {
+              login
+            }
+            repository {
+              nameWithOwner
+            }
+          }
+        }
+      }
+    }
+    """
+
     def get_org_open_prs_graphql(self, org_name: str, team_repos: List[str] = None) -> List[dict]:
         """
         Fetch ALL open PRs from an organization using GraphQL Search API.
         This is much faster than REST API as it uses a single query.
-        
+
+        Results are served from the 60s module cache, so Streamlit reruns
+        triggered by widget interaction don't repeat the network work.
+
         Args:
             org_name: GitHub organization name
             team_repos: Optional list of repo full names to filter by (e.g., ["org/repo1", "org/repo2"])
-        
+
         Returns:
             List of PRs sorted by updated_at descending
         """
+        return _fetch_org_prs_graphql(self.token, org_name, tuple(team_repos or ()))
+
+    def _get_org_open_prs_uncached(self, org_name: str, team_repos: List[str] = None) -> List[dict]:
+        """
+        Uncached GraphQL PR fetch. When the result spans multiple pages,
+        the search is sharded into updated-at windows that are paged
+        concurrently, so total latency is bounded by the largest window
+        instead of the sum of all pages.
+        """
         if not self.token:
             return []
-        
-        all_prs = []
-        cursor = None
-        has_next = True
-        
-        # GraphQL query to search for open PRs in the organization
-        query = """
-        query($searchQuery: String!, $cursor: String) {
-          search(query: $searchQuery, type: ISSUE, first: 100, after: $cursor) {
-            pageInfo {
-              hasNextPage
-              endCursor
-            }
-            nodes {
-              ... on PullRequest {
-                number
-                title
-                url
-                isDraft
-                createdAt
-                updatedAt
-                headRefName
-                baseRefName
-                mergeable
-                author {
-                  login
-                }
-                repository {
-                  nameWithOwner
-                }
-                labels(first: 10) {
-                  nodes {
-                    name
-                  }
-                }
-              }
-            }
-          }
-        }
-        """
-        
-        # Build search query string
-        search_query = f"org:{org_name} is:pr is:open"
-        
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-        }
-        
+
+        session = self._session
+
         try:
-            while has_next:
-                variables = {
-                    "searchQuery": search_query,
-                    "cursor": cursor
-                }
-                
-                response = requests.post(
-                    self.GRAPHQL_ENDPOINT,
-                    headers=headers,
-                    json={"query": query, "variables": variables},
-                    timeout=30
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Check for GraphQL errors
-                if "errors" in data:
-                    error_msg = data["errors"][0].get("message", "Unknown GraphQL error")
-                    st.error(f"❌ GraphQL Error: {error_msg}")
-                    break
-                
-                search_result = data.get("data", {}).get("search", {})
-                nodes = search_result.get("nodes", [])
-                page_info = search_result.get("pageInfo", {})
-                
-                # Process each PR
-                for node in nodes:
-                    if node:  # Skip null nodes
-                        formatted = self._format_graphql_pr(node)
-                        all_prs.append(formatted)
-                
-                # Pagination
-                has_next = page_info.get("hasNextPage", False)
-                cursor = page_info.get("endCursor")
-                
+            if team_repos:
+                # Push the repo filter server-side: search accepts multiple
+                # repo: qualifiers, batched to stay under query-length limits
+                batches = [team_repos[i:i + 5] for i in range(0, len(team_repos), 5)]
+                queries = [
+                    "is:pr is:open " + " ".join(f"repo:{r}" for r in batch)
+                    for batch in batches
+                ]
+                with ThreadPoolExecutor(max_workers=min(8, len(queries))) as executor:
+                    chunks = list(executor.map(
+                        lambda q: self._drain_search(session, q),
+                        queries
+                    ))
+                all_prs = [pr for chunk in chunks for pr in chunk]
+            else:
+                # Org-wide search; first page doubles as a probe and
+                # single-page orgs finish here
+                search_query = f"org:{org_name} is:pr is:open"
+                result = self._search_page(session, search_query, None)
+                all_prs = [self._format_graphql_pr(n) for n in result.get("nodes", []) if n]
+
+                if result.get("pageInfo", {}).get("hasNextPage", False):
+                    # Multi-page result: shard by updated-at window and drain
+                    # each cursor chain in parallel over the shared session
+                    windows = self._build_search_windows()
+                    with ThreadPoolExecutor(max_workers=len(windows)) as executor:
+                        chunks = list(executor.map(
+                            lambda w: self._drain_search(session, f"{search_query} {w}"),
+                            windows
+                        ))
+
+                    # Window boundaries are inclusive dates, so dedupe by URL
+                    seen = set()
+                    all_prs = []
+                    for chunk in chunks:
+                        for pr in chunk:
+                            if pr["url"] not in seen:
+                                seen.add(pr["url"])
+                                all_prs.append(pr)
+
         except requests.RequestException as e:
             st.error(f"❌ Erro na requisição GraphQL: {e}")
             return []
-        
-        # Filter by team repos if provided
-        if team_repos:
-            team_repos_set = set(team_repos)
-            all_prs = [pr for pr in all_prs if pr.get("repo") in team_repos_set]
-        
+
         # Sort by updated_at descending
         all_prs.sort(key=lambda x: x.get("updated_at", datetime.min), reverse=True)
-        
+
         return all_prs
+
+    def _search_page(self, session: requests.Session, search_query: str, cursor: Optional[str]) -> dict:
+        """Fetch a single search page, raising on HTTP or GraphQL errors."""
+        response = session.post(
+            self.GRAPHQL_ENDPOINT,
+            json={
+                "query": self._SEARCH_QUERY,
+                "variables": {"searchQuery": search_query, "cursor": cursor},
+            },
+            timeout=30
+        )
+        response.raise_for_status()
+
+        data = response.json()
+        if "errors" in data:
+            error_msg = data["errors"][0].get("message", "Unknown GraphQL error")
+            raise requests.RequestException(f"GraphQL Error: {error_msg}")
+
+        return data.get("data", {}).get("search", {})
+
+    def _drain_search(self, session: requests.Session, search_query: str) -> List[dict]:
+        """Page through a single search query until exhausted."""
+        prs = []
+        cursor = None
+        has_next = True
+
+        while has_next:
+            result = self._search_page(session, search_query, cursor)
+            for node in result.get("nodes", []):
+                if node:  # Skip null nodes
+                    prs.append(self._format_graphql_pr(node))
+
+            page_info = result.get("pageInfo", {})
+            has_next = page_info.get("hasNextPage", False)
+            cursor = page_info.get("endCursor")
+
+        return prs
+
+    @staticmethod
+    def _build_search_windows() -> List[str]:
+        """Split the search space into updated-at windows for parallel paging."""
+        today = datetime.now(timezone.utc).date()
+        cutoffs = [today - timedelta(days=d) for d in _SEARCH_WINDOW_DAYS]
+
+        windows = [f"updated:>={cutoffs[0].isoformat()}"]
+        for newer, older in zip(cutoffs, cutoffs[1:]):
+            windows.append(f"updated:{older.isoformat()}..{newer.isoformat()}")
+        windows.append(f"updated:<{cutoffs[-1].isoformat()}")
+
+        return windows
     
     def _format_graphql_pr(self, node: dict) -> dict:
         """Format GraphQL PR node to standard dict format."""
@@ -145,7 +224,7 @@ class GithubService:
             "labels": [label.get("name", "") for label in node.get("labels", {}).get("nodes", [])],
             "url": node.get("url", ""),
             "draft": node.get("isDraft", False),
-            "mergeable": node.get("mergeable") == "MERGEABLE",
+            "mergeable": node.get("mergeable") == "MERGEABLE" if node.get("mergeable") else None,
             "head_branch": node.get("headRefName", ""),
             "base_branch": node.get("baseRefName", ""),
             "repo": node.get("repository", {}).get("nameWithOwner", ""),
@@ -156,8 +235,7 @@ class GithubService:
         if not dt_str:
             return datetime.min
         try:
-            # Handle ISO format with Z suffix
-            return datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
+            return _parse_iso(dt_str)
         except (ValueError, AttributeError):
             return datetime.min
 
@@ -184,7 +262,11 @@ class GithubService:
             return []
 
     def get_team_repos(self, org_name: str, team_slug: str) -> List[str]:
-        """Get all repositories accessible by a team."""
+        """Get all repositories accessible by a team (cached for 60s)."""
+        return _fetch_team_repos(self.token, org_name, team_slug)
+
+    def _get_team_repos_uncached(self, org_name: str, team_slug: str) -> List[str]:
+        """Uncached REST fetch of a team's repositories."""
         if not self.client:
             return []
             
@@ -197,7 +279,25 @@ class GithubService:
             return []
 
     def get_all_team_prs(self, repo_names: List[str]) -> List[dict]:
-        """Get open PRs from a list of repositories (REST API - legacy)."""
+        """
+        Get open PRs from a list of repositories.
+
+        Routed through the GraphQL search so one batched query replaces a
+        sequential REST pagination chain per repository.
+        """
+        if not repo_names:
+            return []
+
+        if self.token:
+            # Repos share the org prefix (org/repo); GraphQL filters by
+            # full name so the org is only needed for the search scope
+            org_name = repo_names[0].split("/")[0]
+            return self.get_org_open_prs_graphql(org_name, team_repos=repo_names)
+
+        return self._get_all_team_prs_rest(repo_names)
+
+    def _get_all_team_prs_rest(self, repo_names: List[str]) -> List[dict]:
+        """Get open PRs from a list of repositories (REST API - fallback)."""
         all_prs = []
         for repo_name in repo_names:
             try:
@@ -214,16 +314,36 @@ class GithubService:
 
     def _format_pr(self, pr) -> dict:
         """Format GitHub PR object to dictionary (REST API)."""
+        # Index the raw JSON once instead of going through PyGithub's lazy
+        # attributes, which can each trigger an extra HTTP fetch
+        d = pr.raw_data
         return {
-            "number": pr.number,
-            "title": pr.title,
-            "author": pr.user.login,
+            "number": d["number"],
+            "title": d["title"],
+            "author": d["user"]["login"],
             "created_at": pr.created_at,
             "updated_at": pr.updated_at,
-            "labels": [label.name for label in pr.labels],
-            "url": pr.html_url,
-            "draft": pr.draft,
-            "mergeable": pr.mergeable,
-            "head_branch": pr.head.ref,
-            "base_branch": pr.base.ref,
+            "labels": [label["name"] for label in d.get("labels", [])],
+            "url": d["html_url"],
+            "draft": d.get("draft", False),
+            "mergeable": d.get("mergeable"),
+            "head_branch": d["head"]["ref"],
+            "base_branch": d["base"]["ref"],
         }
+
+
+# =========================================
+# Cached module-level fetchers
+# =========================================
+# Streamlit reruns the whole script on every widget interaction; caching at
+# this level keys the expensive network calls on their arguments so repeat
+# renders within the TTL are served from memory.
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_team_repos(token: str, org_name: str, team_slug: str) -> List[str]:
+    return GithubService(token)._get_team_repos_uncached(org_name, team_slug)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_org_prs_graphql(token: str, org_name: str, team_repos: Tuple[str, ...]) -> List[dict]:
+    return GithubService(token)._get_org_open_prs_uncached(org_name, list(team_repos) or None)
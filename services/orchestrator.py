@@ -1,8 +1,80 @@
 import os
+import time
+import atexit
 import requests
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter, Retry
+import xml.etree.ElementTree as ET
 from typing import Optional, Tuple, List
 
+try:
+    # C-backed version comparison; much cheaper per sort key than the
+    # hand-rolled tuple parsing below
+    from packaging.version import Version, InvalidVersion
+except ImportError:
+    Version = None
+
+try:
+    # C parser, roughly an order of magnitude faster than stdlib
+    # ElementTree on bulk nuspec reads; optional
+    from lxml import etree as _lxml_etree
+except ImportError:
+    _lxml_etree = None
+
+if _lxml_etree is not None:
+    # Compiled once, reused across every install
+    _NUSPEC_ID_XPATH = _lxml_etree.XPath("//*[local-name()='id']/text()")
+    _NUSPEC_VERSION_XPATH = _lxml_etree.XPath("//*[local-name()='version']/text()")
+
+
+def _read_nuspec_id_version(fp) -> Tuple[Optional[str], Optional[str]]:
+    """Extract (id, version) from an open .nuspec stream."""
+    if _lxml_etree is not None:
+        root = _lxml_etree.parse(fp)
+        ids = _NUSPEC_ID_XPATH(root)
+        versions = _NUSPEC_VERSION_XPATH(root)
+        return (ids[0] if ids else None, versions[0] if versions else None)
+
+    # Stdlib fallback: stream-parse and stop at the first id/version
+    package_id = None
+    package_version = None
+    for _, elem in ET.iterparse(fp, events=('end',)):
+        tag = elem.tag.rpartition('}')[2]
+        if tag == 'id' and package_id is None:
+            package_id = elem.text
+        elif tag == 'version' and package_version is None:
+            package_version = elem.text
+        if package_id and package_version:
+            break
+    return package_id, package_version
+
+
+def _odata_quote(value: str) -> str:
+    """Escape a string literal for an OData $filter (single quotes doubled)."""
+    return value.replace("'", "''")
+
+
+def _version_sort_key(v):
+    """
+    Sortable key for version strings that may be malformed.
+
+    Valid versions compare via packaging.Version when available; anything
+    unparsable falls back to (type, value) tuples so int/str comparisons
+    never collide.
+    """
+    if Version is not None:
+        try:
+            return (0, Version(str(v)))
+        except InvalidVersion:
+            pass
+    try:
+        parts = str(v).replace('-', '.').split('.')
+        return (1, [(0, int(x)) if x.isdigit() else (1, x.lower()) for x in parts])
+    except Exception:
+        return (1, [(1, str(v).lower())])
+
+
 class OrchestratorService:
     def __init__(self, config: dict):
         self.config = config
@@ -13,8 +85,95 @@ class OrchestratorService:
         self.client_secret = config.get("orch_client_secret", "")
         self.scope = config.get("orch_scope", "OR.Default")
 
+        # Persistent session: every call below hits the same Orchestrator
+        # host, so keep-alive + a pooled adapter avoids a fresh TCP+TLS
+        # handshake per request
+        self.session = requests.Session()
+        self.session.headers.update({"X-UIPATH-TenantName": self.tenant})
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504]),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        atexit.register(self.session.close)
+
+        # One pool for the service's lifetime; per-call executors pay
+        # thread-creation overhead on every parallel operation
+        self._pool = ThreadPoolExecutor(
+            max_workers=int(config.get("orch_workers", 10)),
+            thread_name_prefix="orch",
+        )
+
+        # (token, expiry_epoch) — tokens are valid for ~1h, so reruns
+        # within the window skip the OAuth round-trip entirely
+        self._token_cache = None
+
+        # (tenant, package_id) -> (versions, fetched_at); Streamlit reruns
+        # re-request the same IDs constantly, so serve them from memory
+        # for a few minutes instead of re-hitting GetVersions
+        self._versions_cache = {}
+
+    @classmethod
+    def get(cls, config: dict) -> "OrchestratorService":
+        """
+        Fetch the shared instance from st.session_state, creating it on
+        first use or when the relevant config changed.
+
+        Reusing one instance across Streamlit reruns keeps the pooled
+        Session, token cache and versions cache alive, so navigating the
+        UI stops costing fresh TLS handshakes and OAuth round-trips.
+        """
+        fingerprint = tuple(
+            config.get(key, "")
+            for key in ("orch_url", "orch_org", "orch_tenant", "orch_client_id", "orch_client_secret", "orch_scope")
+        )
+        cached = st.session_state.get("_orch_service")
+        if cached is None or st.session_state.get("_orch_service_fp") != fingerprint:
+            if cached is not None:
+                cached.close()
+            cached = cls(config)
+            st.session_state["_orch_service"] = cached
+            st.session_state["_orch_service_fp"] = fingerprint
+        return cached
+
+    def close(self):
+        """Release the pooled HTTP connections and worker threads."""
+        self._pool.shutdown(wait=False)
+        self.session.close()
+
+    def _auth_headers(self, token: str) -> dict:
+        """Per-call auth header; the tenant header lives on the session."""
+        return {"Authorization": f"Bearer {token}"}
+
+    @staticmethod
+    def _iter_raw(response, length=1 << 20):
+        """
+        Yield decoded body chunks straight from the raw socket buffer.
+
+        1 MB reads move bytes in C like shutil.copyfileobj, without the
+        per-8KB bytes allocation iter_content pays — while still letting
+        callers tee each chunk into a hash or a second sink.
+        """
+        response.raw.decode_content = True
+        while True:
+            chunk = response.raw.read(length)
+            if not chunk:
+                break
+            yield chunk
+
+    def invalidate_token(self):
+        """Drop the cached token (e.g. after a 401) to force a refresh."""
+        self._token_cache = None
+
     def get_token(self) -> Optional[str]:
-        """Authenticate with Orchestrator and get access token."""
+        """Authenticate with Orchestrator and get access token (cached until near expiry)."""
+        if self._token_cache is not None:
+            token, expiry = self._token_cache
+            if time.time() < expiry:
+                return token
+
         # Determine Identity URL (Cloud uses 'identity_', On-Prem uses 'identity')
         identity_path = "identity_" if "cloud.uipath.com" in self.base_url else "identity"
         token_url = f"{self.base_url.rstrip('/')}/{identity_path}/connect/token"
@@ -27,9 +186,15 @@ class OrchestratorService:
         }
         
         try:
-            response = requests.post(token_url, data=payload, timeout=30)
+            response = self.session.post(token_url, data=payload, timeout=30)
             response.raise_for_status()
-            return response.json().get("access_token")
+            data = response.json()
+            token = data.get("access_token")
+            if token:
+                # Refresh one minute before the server-side expiry
+                expires_in = data.get("expires_in", 3600)
+                self._token_cache = (token, time.time() + expires_in - 60)
+            return token
         except requests.exceptions.JSONDecodeError:
             st.error(f"❌ Erro de Resposta Inválida (Não é JSON).")
             st.error(f"URL Tentada: {token_url}")
@@ -49,10 +214,7 @@ class OrchestratorService:
         """
         upload_url = f"{self.base_url}/{self.org}/{self.tenant}/orchestrator_/odata/Processes/UiPath.Server.Configuration.OData.UploadPackage"
         
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "X-UIPATH-TenantName": self.tenant,
-        }
+        headers = self._auth_headers(token)
         
         if folder_id:
             headers["X-UIPATH-OrganizationUnitId"] = str(folder_id)
@@ -60,7 +222,7 @@ class OrchestratorService:
         try:
             with open(nupkg_path, "rb") as f:
                 files = {"file": (os.path.basename(nupkg_path), f, "application/octet-stream")}
-                response = requests.post(upload_url, headers=headers, files=files, timeout=120)
+                response = self.session.post(upload_url, headers=headers, files=files, timeout=120)
                 
             if response.status_code in [200, 201]:
                 return True, "✅ Pacote enviado com sucesso!"
@@ -69,26 +231,36 @@ class OrchestratorService:
         except requests.RequestException as e:
             return False, f"❌ Erro de conexão: {e}"
 
-    def download_package(self, token: str, package_id: str, version: str, output_dir: str) -> Tuple[bool, str]:
-        """Download a package from Orchestrator."""
+    def download_package(self, token: str, package_id: str, version: str, output_dir: str,
+                         return_hash: bool = False) -> Tuple[bool, str]:
+        """
+        Download a package from Orchestrator.
+
+        The SHA-512 is computed while the chunks are written, so callers
+        that need it (return_hash=True, result becomes (path, sha512_b64))
+        get it without a second pass over the file.
+        """
         download_url = f"{self.base_url}/{self.org}/{self.tenant}/orchestrator_/odata/Processes/UiPath.Server.Configuration.OData.DownloadPackage(key='{package_id}',version='{version}')"
-        
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "X-UIPATH-TenantName": self.tenant,
-        }
-        
+
+        headers = self._auth_headers(token)
+
         try:
-            response = requests.get(download_url, headers=headers, timeout=120, stream=True)
+            response = self.session.get(download_url, headers=headers, timeout=120, stream=True)
             response.raise_for_status()
-            
+
             filename = f"{package_id}.{version}.nupkg"
             output_path = os.path.join(output_dir, filename)
-            
+
+            import hashlib
+            import base64
+            h = hashlib.sha512()
             with open(output_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
+                for chunk in self._iter_raw(response):
+                    h.update(chunk)
                     f.write(chunk)
-            
+
+            if return_hash:
+                return True, (output_path, base64.b64encode(h.digest()).decode('utf-8'))
             return True, output_path
         except requests.RequestException as e:
             return False, f"❌ Erro ao baixar pacote: {e}"
@@ -97,56 +269,76 @@ class OrchestratorService:
         """List packages from Orchestrator."""
         url = f"{self.base_url}/{self.org}/{self.tenant}/orchestrator_/odata/Processes"
         
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "X-UIPATH-TenantName": self.tenant,
-        }
+        headers = self._auth_headers(token)
         
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.session.get(url, headers=headers, timeout=30)
             response.raise_for_status()
             return response.json().get("value", [])
         except requests.RequestException as e:
             st.error(f"❌ Erro ao listar pacotes: {e}")
             return []
 
-    def list_libraries(self, token: str, search_term: str = None) -> List[dict]:
-        """List libraries from Orchestrator (Tenant level) - returns only latest version of each."""
+    def iter_libraries(self, token: str, search_term: str = None):
+        """
+        Yield libraries from Orchestrator (Tenant level) page by page.
+
+        Follows the server-driven @odata.nextLink instead of capping the
+        result at one page, so tenants with more libraries than $top are
+        no longer silently truncated — and callers can start working on
+        the first page while later ones are still in flight.
+        """
         url = f"{self.base_url}/{self.org}/{self.tenant}/orchestrator_/odata/Libraries"
-        
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "X-UIPATH-TenantName": self.tenant,
-        }
-        
+
+        headers = self._auth_headers(token)
+
         # Query to get libraries - this returns only latest versions by default
         params = {
             "$orderby": "Id asc",
-            "$top": "100",
+            "$top": "200",
             "$select": "Id,Version,Title,Authors,Published,IsLatestVersion"
         }
         if search_term:
-            params["$filter"] = f"contains(tolower(Id), tolower('{search_term}'))"
-        
+            # Filter on the raw column: tolower() on both sides forced the
+            # server to lowercase every Id per row, defeating any index
+            params["$filter"] = f"contains(Id, '{_odata_quote(search_term)}')"
+
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=60)
-            response.raise_for_status()
-            return response.json().get("value", [])
+            while url:
+                response = self.session.get(url, headers=headers, params=params, timeout=60)
+                response.raise_for_status()
+                data = response.json()
+                yield from data.get("value", [])
+                # nextLink already embeds the query string
+                url = data.get("@odata.nextLink")
+                params = None
         except requests.RequestException as e:
             print(f"❌ Erro ao listar libraries: {e}")
-            return []
+
+    def list_libraries(self, token: str, search_term: str = None) -> List[dict]:
+        """List libraries from Orchestrator (Tenant level) - returns only latest version of each."""
+        return list(self.iter_libraries(token, search_term))
+
+    # How long a GetVersions result stays fresh (seconds)
+    _VERSIONS_TTL = 300
+
+    def clear_versions_cache(self):
+        """Drop memoized GetVersions results (e.g. on explicit refresh)."""
+        self._versions_cache.clear()
 
     def get_library_versions(self, token: str, package_id: str) -> List[str]:
-        """Get ALL versions of a specific library using GetVersions endpoint."""
+        """Get ALL versions of a specific library using GetVersions endpoint (cached for 5 min)."""
+        cache_key = (self.tenant, package_id)
+        cached = self._versions_cache.get(cache_key)
+        if cached is not None and time.time() - cached[1] < self._VERSIONS_TTL:
+            return cached[0]
+
         url = f"{self.base_url}/{self.org}/{self.tenant}/orchestrator_/odata/Libraries/UiPath.Server.Configuration.OData.GetVersions(packageId='{package_id}')"
-        
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "X-UIPATH-TenantName": self.tenant,
-        }
-        
+
+        headers = self._auth_headers(token)
+
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.session.get(url, headers=headers, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -165,63 +357,46 @@ class OrchestratorService:
                 else:
                     versions.append(str(v))
             
-            # Sort versions descending
-            def version_key(v):
-                """
-                Create a sortable key for version strings.
-                Returns tuples of (type_priority, value) to avoid int/str comparison issues.
-                Numbers get priority 0, strings get priority 1, so numbers sort before strings.
-                """
-                try:
-                    parts = str(v).replace('-', '.').split('.')
-                    result = []
-                    for x in parts:
-                        if x.isdigit():
-                            result.append((0, int(x)))  # Numeric parts
-                        else:
-                            result.append((1, x.lower()))  # String parts (lowercase for consistent sorting)
-                    return result
-                except Exception:
-                    return [(1, str(v).lower())]
-            
-            sorted_versions = sorted(versions, reverse=True, key=version_key)
-            
-            return sorted_versions
+            # Dedupe (common in the raw response) and sort descending
+            result = sorted(dict.fromkeys(versions), reverse=True, key=_version_sort_key)
+            self._versions_cache[cache_key] = (result, time.time())
+            return result
         except requests.RequestException as e:
             print(f"⚠️ Erro ao obter versões de {package_id}: {e}")
             # Fallback: return empty list
             return []
 
     def list_libraries_with_all_versions(self, token: str, search_term: str = None) -> dict:
-        """List libraries and fetch ALL versions for each one."""
-        # First, get the list of unique library IDs
-        libraries = self.list_libraries(token, search_term)
-        
+        """List libraries and fetch ALL versions for each one (in parallel)."""
+        # Pipeline the two phases: version lookups are submitted the moment
+        # each library is yielded, so they overlap the remaining list pages
+        libraries = []
+        futures = {}
+        for lib in self.iter_libraries(token, search_term):
+            libraries.append(lib)
+            lib_id = lib.get("Id")
+            if lib_id and lib_id not in futures:
+                futures[lib_id] = self._pool.submit(self.get_library_versions, token, lib_id)
+
+        versions_by_id = {lib_id: fut.result() for lib_id, fut in futures.items()}
+
         if not libraries:
             return {}
-        
-        # Get unique package IDs
-        unique_ids = list(set(lib.get("Id") for lib in libraries if lib.get("Id")))
-        
-        # For each package, get all versions
+
         grouped = {}
         for lib in libraries:
             lib_id = lib.get("Id", "Unknown")
             if lib_id not in grouped:
-                # Get all versions for this package
-                all_versions = self.get_library_versions(token, lib_id)
-                
                 # If GetVersions failed, use at least the version we have
-                if not all_versions:
-                    all_versions = [lib.get("Version", "Unknown")]
-                
+                all_versions = versions_by_id.get(lib_id) or [lib.get("Version", "Unknown")]
+
                 grouped[lib_id] = {
                     "id": lib_id,
                     "title": lib.get("Title", lib_id),
                     "authors": lib.get("Authors", ""),
                     "versions": all_versions
                 }
-        
+
         return grouped
 
     def group_libraries_by_id(self, libraries: List[dict]) -> dict:
@@ -239,117 +414,208 @@ class OrchestratorService:
             grouped[lib_id]["versions"].append(lib.get("Version", "Unknown"))
         
         # Sort versions descending for each package
-        def safe_version_key(v):
-            """Version key that avoids int/str comparison issues."""
-            try:
-                parts = str(v).replace('-', '.').split('.')
-                return [(0, int(x)) if x.isdigit() else (1, x.lower()) for x in parts]
-            except Exception:
-                return [(1, str(v).lower())]
-        
         for pkg in grouped.values():
-            pkg["versions"] = sorted(pkg["versions"], reverse=True, key=safe_version_key)
-        
+            pkg["versions"] = sorted(dict.fromkeys(pkg["versions"]), reverse=True, key=_version_sort_key)
+
         return grouped
 
-    def download_library(self, token: str, package_id: str, version: str, output_dir: str) -> Tuple[bool, str]:
-        """Download a library package from Orchestrator - tries multiple endpoints."""
-        
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "X-UIPATH-TenantName": self.tenant,
-        }
-        
+    def download_library_stream(self, token: str, package_id: str, version: str):
+        """
+        Stream a library download from the first endpoint that answers 200.
+
+        Returns Tuple[bool, Iterator[bytes] | str]: (True, chunk_iterator) on
+        success or (False, error_message). Callers can tee the chunks to disk
+        and memory in a single pass instead of downloading then re-reading.
+        """
+        headers = self._auth_headers(token)
+
+        # Hoist the invariants: one lowercase pass and one base prefix
+        pid_lower = package_id.lower()
+        base = f"{self.base_url}/{self.org}/{self.tenant}/orchestrator_"
+
         # List of endpoints to try (Libraries have different endpoints than Processes)
         endpoints = [
             # 1. OData Libraries endpoint with key:version format
-            f"{self.base_url}/{self.org}/{self.tenant}/orchestrator_/odata/Libraries/UiPath.Server.Configuration.OData.DownloadPackage(key='{package_id}:{version}')",
+            f"{base}/odata/Libraries/UiPath.Server.Configuration.OData.DownloadPackage(key='{package_id}:{version}')",
             # 2. NuGet V2 feed format for Libraries
-            f"{self.base_url}/{self.org}/{self.tenant}/orchestrator_/nuget/Libraries/v2/package/{package_id}/{version}",
+            f"{base}/nuget/Libraries/v2/package/{package_id}/{version}",
             # 3. NuGet V3 flat container format
-            f"{self.base_url}/{self.org}/{self.tenant}/orchestrator_/nuget/Libraries/v3/flatcontainer/{package_id.lower()}/{version}/{package_id.lower()}.{version}.nupkg",
+            f"{base}/nuget/Libraries/v3/flatcontainer/{pid_lower}/{version}/{pid_lower}.{version}.nupkg",
             # 4. Tenant-level library feed
-            f"{self.base_url}/{self.org}/{self.tenant}/orchestrator_/nuget/v3/flatcontainer/{package_id.lower()}/{version}/{package_id.lower()}.{version}.nupkg",
+            f"{base}/nuget/v3/flatcontainer/{pid_lower}/{version}/{pid_lower}.{version}.nupkg",
         ]
-        
+
+        # Cheap HEAD preflight: probe all endpoints concurrently and only
+        # commit a 120s streaming GET to the first (in priority order)
+        # that actually serves the package.
+        def _probe(endpoint):
+            try:
+                probe = self.session.head(endpoint, headers=headers, timeout=15, allow_redirects=True)
+                if probe.status_code != 200:
+                    return False
+                content_type = probe.headers.get("Content-Type", "")
+                if "octet-stream" not in content_type and "zip" not in content_type:
+                    return False
+                content_length = probe.headers.get("Content-Length")
+                return content_length is None or int(content_length) > 1000
+            except requests.RequestException:
+                return False
+
+        for endpoint, ok in zip(endpoints, self._pool.map(_probe, endpoints)):
+            if not ok:
+                continue
+            try:
+                response = self.session.get(endpoint, headers=headers, timeout=120, stream=True, allow_redirects=True)
+                if response.status_code == 200:
+                    return True, self._iter_raw(response)
+            except requests.RequestException:
+                continue
+
+        # Fallback: some feeds reject HEAD — probe with GET as before
         last_error = None
         for endpoint in endpoints:
             try:
                 print(f"Tentando: {endpoint}")
-                response = requests.get(endpoint, headers=headers, timeout=120, stream=True, allow_redirects=True)
-                
+                response = self.session.get(endpoint, headers=headers, timeout=120, stream=True, allow_redirects=True)
+
                 if response.status_code == 200:
-                    filename = f"{package_id}.{version}.nupkg"
-                    output_path = os.path.join(output_dir, filename)
-                    
-                    with open(output_path, "wb") as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                    
-                    # Verify it's a valid file (not HTML error page)
-                    if os.path.getsize(output_path) > 1000:  # NuGet packages are at least a few KB
-                        return True, output_path
-                    else:
-                        os.remove(output_path)
+                    # Reject obvious error pages up front when the server
+                    # announces the size (NuGet packages are at least a few KB)
+                    content_length = response.headers.get("Content-Length")
+                    if content_length is not None and int(content_length) <= 1000:
                         last_error = "Downloaded file too small, likely not a valid package"
+                        continue
+                    return True, self._iter_raw(response)
                 else:
                     last_error = f"HTTP {response.status_code}"
-                    
+
             except requests.RequestException as e:
                 last_error = str(e)
                 continue
-        
+
         return False, f"❌ Erro ao baixar library (todos endpoints falharam): {last_error}"
 
-    def install_nupkg_to_cache(self, nupkg_path: str) -> Tuple[bool, str]:
-        """Install a .nupkg file to the local NuGet cache with proper metadata files."""
+    def download_library(self, token: str, package_id: str, version: str, output_dir: str,
+                         return_hash: bool = False) -> Tuple[bool, str]:
+        """
+        Download a library package from Orchestrator - tries multiple endpoints.
+
+        With return_hash=True the success result is (path, sha512_b64),
+        hashed inline with the write so no second file pass is needed.
+        """
+        success, stream = self.download_library_stream(token, package_id, version)
+        if not success:
+            return False, stream
+
+        filename = f"{package_id}.{version}.nupkg"
+        output_path = os.path.join(output_dir, filename)
+
+        import hashlib
+        import base64
+        h = hashlib.sha512()
+        try:
+            with open(output_path, "wb") as f:
+                for chunk in stream:
+                    h.update(chunk)
+                    f.write(chunk)
+        except requests.RequestException as e:
+            return False, f"❌ Erro ao baixar library: {e}"
+
+        # Verify it's a valid file (not HTML error page)
+        if os.path.getsize(output_path) > 1000:  # NuGet packages are at least a few KB
+            if return_hash:
+                return True, (output_path, base64.b64encode(h.digest()).decode('utf-8'))
+            return True, output_path
+
+        os.remove(output_path)
+        return False, "❌ Erro ao baixar library: Downloaded file too small, likely not a valid package"
+
+    def install_nupkg_to_cache(self, nupkg_path: str, data=None,
+                               sha512_b64: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        Install a .nupkg file to the local NuGet cache with proper metadata files.
+
+        When `data` (an in-memory buffer with the package bytes) is provided,
+        the nuspec parse, extraction, copy and hash all operate on the buffer
+        instead of re-reading the file from disk. A `sha512_b64` computed by
+        the download (see download_library) skips the hash pass entirely.
+        """
         import subprocess
         import zipfile
         import json
         import hashlib
         import base64
-        
+
+        # zipfile accepts a path or a seekable file-like object
+        source = data if data is not None else nupkg_path
+
         try:
-            # Read package info from nuspec inside nupkg
-            with zipfile.ZipFile(nupkg_path, 'r') as zf:
-                # Find .nuspec file
-                nuspec_files = [f for f in zf.namelist() if f.endswith('.nuspec')]
-                if not nuspec_files:
+            # One ZipFile handle serves both the nuspec parse and the
+            # extraction pass (previously the archive was opened twice)
+            with zipfile.ZipFile(source, 'r') as zf:
+                # Find .nuspec file (first hit, no full-list materialization)
+                nuspec_name = next((n for n in zf.namelist() if n.endswith('.nuspec')), None)
+                if nuspec_name is None:
                     return False, "No .nuspec found in package"
-                
-                # Parse nuspec to get package id and version
-                nuspec_content = zf.read(nuspec_files[0]).decode('utf-8')
-                
-                # Simple XML parsing for id and version
-                import re
-                id_match = re.search(r'<id>([^<]+)</id>', nuspec_content, re.IGNORECASE)
-                version_match = re.search(r'<version>([^<]+)</version>', nuspec_content, re.IGNORECASE)
-                
-                if not id_match or not version_match:
+
+                # Parse just <id> and <version> (lxml when available,
+                # stdlib stream-parse otherwise)
+                with zf.open(nuspec_name) as fp:
+                    package_id, package_version = _read_nuspec_id_version(fp)
+
+                if not package_id or not package_version:
                     return False, "Could not parse package id/version from nuspec"
-                
-                package_id = id_match.group(1)
-                package_version = version_match.group(1)
-            
-            # Determine NuGet cache path
-            nuget_cache = os.path.expanduser("~/.nuget/packages")
-            package_dir = os.path.join(nuget_cache, package_id.lower(), package_version)
-            
-            # Create directory and extract
-            os.makedirs(package_dir, exist_ok=True)
-            
-            with zipfile.ZipFile(nupkg_path, 'r') as zf:
-                zf.extractall(package_dir)
-            
-            # Copy the nupkg itself
+
+                # Determine NuGet cache path
+                nuget_cache = os.path.expanduser("~/.nuget/packages")
+                package_dir = os.path.join(nuget_cache, package_id.lower(), package_version)
+
+                # Create directory and extract only what NuGet restore
+                # consumes — OPC metadata (_rels/, [Content_Types].xml,
+                # package/) never needs to hit the disk
+                os.makedirs(package_dir, exist_ok=True)
+                members = [
+                    m for m in zf.namelist()
+                    if m.endswith('.nuspec')
+                    or m.split('/', 1)[0] in ('lib', 'build', 'content', 'tools', 'runtimes', 'contentFiles')
+                ]
+                zf.extractall(package_dir, members=members)
+
+            # Place the nupkg itself in the cache
             import shutil
             nupkg_dest = os.path.join(package_dir, f"{package_id.lower()}.{package_version}.nupkg")
-            shutil.copy2(nupkg_path, nupkg_dest)
-            
-            # Calculate SHA512 hash of the nupkg file
-            with open(nupkg_path, 'rb') as f:
-                sha512_hash = hashlib.sha512(f.read()).digest()
-                sha512_base64 = base64.b64encode(sha512_hash).decode('utf-8')
+            if data is not None:
+                with open(nupkg_dest, 'wb') as f:
+                    f.write(data.getbuffer())
+            else:
+                try:
+                    # Hardlink moves zero bytes when cache and source share
+                    # a filesystem; fall back to a real copy otherwise
+                    if os.path.exists(nupkg_dest):
+                        if os.path.samefile(nupkg_path, nupkg_dest):
+                            pass  # already linked by a previous install
+                        else:
+                            os.remove(nupkg_dest)
+                            os.link(nupkg_path, nupkg_dest)
+                    else:
+                        os.link(nupkg_path, nupkg_dest)
+                except OSError:
+                    shutil.copy2(nupkg_path, nupkg_dest)
+
+            # Calculate SHA512 hash of the nupkg bytes (unless the download
+            # already produced it while writing)
+            if sha512_b64 is not None:
+                sha512_base64 = sha512_b64
+            elif data is not None:
+                sha512_base64 = base64.b64encode(hashlib.sha512(data.getbuffer()).digest()).decode('utf-8')
+            else:
+                # Stream in 1 MB chunks instead of loading the whole
+                # package (can be hundreds of MB) into memory
+                h = hashlib.sha512()
+                with open(nupkg_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        h.update(chunk)
+                sha512_base64 = base64.b64encode(h.digest()).decode('utf-8')
             
             # Create .nupkg.sha512 file (base64 encoded SHA512 hash)
             sha512_file = os.path.join(package_dir, f"{package_id.lower()}.{package_version}.nupkg.sha512")
@@ -1,12 +1,36 @@
 import os
+import errno
 import shutil
 import re
+import shlex
+import hashlib
 import subprocess
 import tempfile
-from typing import Tuple, List, Optional
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Tuple, List, Optional
 from pathlib import Path
 
 class PackageManager:
+    # Dependency failure signatures from uipcli/NuGet output. Anchored to
+    # whole lines so one finditer pass over the full buffer captures every
+    # offending line without a Python-level loop
+    _DEP_ERROR_RE = re.compile(
+        r"^.*(?:" + "|".join(f"(?:{p})" for p in (
+            r"Unable to resolve dependency",
+            r"Could not find package",
+            r"Package '.*?' is not found",
+            r"Missing dependency",
+            r"NU110[12]",
+        )) + r").*$",
+        re.IGNORECASE | re.MULTILINE,
+    )
+
+    # directory -> (st_mtime_ns, newest-first nupkg paths); UI refreshes
+    # with no directory changes become a dict lookup
+    _NUPKG_CACHE: Dict[str, Tuple[int, List[str]]] = {}
+
     @staticmethod
     def run_pack(
         project_path: str,
@@ -25,18 +49,17 @@ class PackageManager:
         
         os.makedirs(output_dir, exist_ok=True)
         
+        # argv list: no shell, no quoting — arguments reach uipcli verbatim
         cmd_parts = [
             "uipcli",
             "package", "pack",
-            f'"{project_path}"',
+            project_path,
             "--output",
-            f'"{output_dir}"',
+            output_dir,
             "--version",
             version,
         ]
         
-        temp_config_path = None
-        
         try:
             # Get local NuGet cache path
             local_cache_path = os.path.expanduser("~/.nuget/packages")
@@ -76,12 +99,12 @@ class PackageManager:
                 if org and tenant:
                     # Add library authentication params (may or may not work)
                     cmd_parts.extend([
-                        "--libraryOrchestratorAccountForApp", f'"{org}"',
-                        "--libraryOrchestratorApplicationId", f'"{auth_config.get("orch_client_id", "")}"',
-                        "--libraryOrchestratorApplicationSecret", f'"{auth_config.get("orch_client_secret", "")}"',
-                        "--libraryOrchestratorApplicationScope", f'"{auth_config.get("orch_scope", "OR.Default")}"',
-                        "--libraryOrchestratorUrl", f'"{base_url}"',
-                        "--libraryOrchestratorTenant", f'"{tenant}"',
+                        "--libraryOrchestratorAccountForApp", org,
+                        "--libraryOrchestratorApplicationId", auth_config.get("orch_client_id", ""),
+                        "--libraryOrchestratorApplicationSecret", auth_config.get("orch_client_secret", ""),
+                        "--libraryOrchestratorApplicationScope", auth_config.get("orch_scope", "OR.Default"),
+                        "--libraryOrchestratorUrl", base_url,
+                        "--libraryOrchestratorTenant", tenant,
                     ])
                     
                     # Add Orchestrator feeds to config
@@ -100,59 +123,144 @@ class PackageManager:
   </packageSources>
 </configuration>"""
 
-            # Write the nuget config
-            fd, temp_config_path = tempfile.mkstemp(suffix=".config", prefix="nuget_")
-            os.close(fd)
-            with open(temp_config_path, "w") as f:
-                f.write(nuget_config_content)
-            cmd_parts.extend(["--nugetConfigFilePath", f'"{temp_config_path}"'])
-            
-            cmd = " ".join(cmd_parts)
-            
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                capture_output=True,
+            # The config only depends on the feed set, which is constant
+            # across a session — reuse one file per distinct content
+            # instead of mkstemp+unlink on every pack
+            cfg_hash = hashlib.blake2b(
+                nuget_config_content.encode(), digest_size=16
+            ).hexdigest()
+            config_path = os.path.join(
+                tempfile.gettempdir(), f"nuget_{cfg_hash}.config"
+            )
+            if not os.path.exists(config_path):
+                with open(config_path, "w") as f:
+                    f.write(nuget_config_content)
+            cmd_parts.extend(["--nugetConfigFilePath", config_path])
+
+            # Shell-quoted form kept only for display/logging
+            cmd = shlex.join(cmd_parts)
+
+            # Stream stdout+stderr line by line instead of buffering the
+            # whole log in memory; only the last lines are kept, which is
+            # plenty for the result panel and for error scanning
+            proc = subprocess.Popen(
+                cmd_parts,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-                timeout=300
+                bufsize=65536
             )
-            
-            output = result.stdout + result.stderr
-            success = result.returncode == 0
-            
+            lines = deque(maxlen=2000)
+
+            # Drain on a helper thread so the main thread can enforce the
+            # deadline; reading the pipe inline would block until EOF and
+            # never time out on a hung uipcli
+            def _drain():
+                with proc.stdout:
+                    for line in proc.stdout:
+                        lines.append(line)
+
+            reader = threading.Thread(target=_drain, daemon=True)
+            reader.start()
+            try:
+                proc.wait(timeout=300)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                raise
+            finally:
+                # Bounded join: a grandchild that inherited the pipe can
+                # keep it open past the kill; the daemon thread is then
+                # simply abandoned with whatever lines it captured
+                reader.join(timeout=5)
+
+            output = "".join(lines)
+            success = proc.returncode == 0
+
             return success, cmd, output
-            
+
         except subprocess.TimeoutExpired:
             return False, cmd, "❌ Timeout: O comando excedeu o limite de 5 minutos"
         except Exception as e:
             return False, cmd, f"❌ Erro: {e}"
-        finally:
-            # Cleanup temp file
-            if temp_config_path and os.path.exists(temp_config_path):
-                try:
-                    os.remove(temp_config_path)
-                except:
-                    pass
+
+    @staticmethod
+    def run_pack_batch(
+        projects: List[Tuple[str, str]],
+        output_dir: str,
+        use_local_cache: bool = True,
+        custom_feed_url: Optional[str] = None,
+        auth_config: Optional[dict] = None,
+        use_orchestrator_feeds: bool = False
+    ) -> List[Tuple[bool, str, str]]:
+        """Pack several projects, overlapping uipcli startup across cores.
+
+        Args:
+            projects: List of (project_path, version) pairs
+
+        Returns:
+            One (success, cmd, output) tuple per project, in input order.
+        """
+        jobs = [
+            (path, output_dir, version, use_local_cache,
+             custom_feed_url, auth_config, use_orchestrator_feeds)
+            for path, version in projects
+        ]
+
+        # Each uipcli run pays .NET startup/JIT cost; for small batches
+        # the pool's own spawn overhead outweighs the overlap
+        if len(jobs) <= 4:
+            return [_run_pack_job(job) for job in jobs]
+
+        with ProcessPoolExecutor(
+            max_workers=min(os.cpu_count() or 1, len(jobs))
+        ) as pool:
+            return list(pool.map(_run_pack_job, jobs))
 
     @staticmethod
     def find_nupkg_files(directory: str) -> List[str]:
-        """Find all .nupkg files in a directory."""
-        nupkg_files = []
-        if os.path.exists(directory):
-            for file in os.listdir(directory):
-                if file.endswith(".nupkg"):
-                    nupkg_files.append(os.path.join(directory, file))
-        return sorted(nupkg_files, key=os.path.getmtime, reverse=True)
+        """Find all .nupkg files in a directory, newest first."""
+        try:
+            dir_mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return []
+
+        cached = PackageManager._NUPKG_CACHE.get(directory)
+        if cached is not None and cached[0] == dir_mtime:
+            return list(cached[1])
+
+        # DirEntry.stat() reuses the data readdir already fetched, so this
+        # avoids one extra stat syscall per file versus os.path.getmtime
+        try:
+            with os.scandir(directory) as it:
+                entries = [
+                    (entry.path, entry.stat().st_mtime)
+                    for entry in it
+                    if entry.is_file() and entry.name.endswith(".nupkg")
+                ]
+        except OSError:
+            return []
+        entries.sort(key=lambda e: e[1], reverse=True)
+        paths = [path for path, _ in entries]
+        PackageManager._NUPKG_CACHE[directory] = (dir_mtime, paths)
+        return list(paths)
 
     @staticmethod
     def move_to_uploaded(nupkg_path: str, base_dir: str) -> str:
         """Move successfully uploaded package to 'uploaded' subfolder."""
         uploaded_dir = Path(base_dir) / "uploaded"
-        uploaded_dir.mkdir(exist_ok=True)
-        
+        uploaded_dir.mkdir(parents=True, exist_ok=True)
+
         dest_path = uploaded_dir / Path(nupkg_path).name
         try:
-            shutil.move(nupkg_path, dest_path)
+            # Same-filesystem case is a single rename(2); only fall back
+            # to the stat-heavy copy+unlink when crossing devices
+            try:
+                os.replace(nupkg_path, dest_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(nupkg_path, dest_path)
             return str(dest_path)
         except Exception as e:
             return f"Error moving file: {e}"
@@ -160,19 +268,12 @@ class PackageManager:
     @staticmethod
     def check_dependency_errors(output: str) -> List[str]:
         """Check for dependency errors in build output."""
-        errors = []
-        patterns = [
-            r"Unable to resolve dependency",
-            r"Could not find package",
-            r"Package '.*' is not found",
-            r"Missing dependency",
-            r"NU1101",
-            r"NU1102",
+        return [
+            m.group(0).strip()
+            for m in PackageManager._DEP_ERROR_RE.finditer(output)
         ]
-        
-        for line in output.split("\n"):
-            for pattern in patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    errors.append(line.strip())
-                    break
-        return errors
+
+
+def _run_pack_job(job: Tuple) -> Tuple[bool, str, str]:
+    """Run one batch entry; module-level so worker processes can pickle it."""
+    return PackageManager.run_pack(*job)
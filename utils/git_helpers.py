@@ -1,7 +1,16 @@
 import re
 import os
+import configparser
 from typing import Optional, Dict
-from git import Repo, GitCommandError
+
+# -fork (case insensitive) optionally followed by .git at the end of the
+# string; compiled once at import instead of re-parsed per call
+_FORK_RE = re.compile(r"(-fork)(\.git)?$", re.IGNORECASE)
+_FORK_CHECK_RE = re.compile(r"-fork", re.IGNORECASE)
+
+# repo path -> (.git/config st_mtime_ns, result); repeated calls for the
+# same repo within a session skip the config parse
+_REMOTE_CACHE: Dict[str, tuple] = {}
 
 def infer_upstream_url(origin_url: str) -> str:
     """
@@ -11,9 +20,7 @@ def infer_upstream_url(origin_url: str) -> str:
         origin: https://github.com/myorg/MyProject-Fork.git
         upstream: https://github.com/myorg/MyProject.git
     """
-    # Pattern looks for -fork (case insensitive) optionally followed by .git at the end of the string
-    pattern = r"(-fork)(\.git)?$"
-    base = re.sub(pattern, "", origin_url, flags=re.IGNORECASE)
+    base = _FORK_RE.sub("", origin_url)
     
     # Ensure .git suffix if it was present or if we want to standardize
     if origin_url.endswith(".git") and not base.endswith(".git"):
@@ -41,31 +48,38 @@ def detect_remote_info(repo_path: str) -> Dict[str, str]:
     }
     
     try:
-        if not os.path.exists(os.path.join(repo_path, ".git")):
-            return result
-            
-        repo = Repo(repo_path)
-        
-        # Get Origin
+        config_path = os.path.join(repo_path, ".git", "config")
         try:
-            origin_url = repo.remotes.origin.url
+            mtime_ns = os.stat(config_path).st_mtime_ns
+        except OSError:
+            return result
+
+        cached = _REMOTE_CACHE.get(repo_path)
+        if cached is not None and cached[0] == mtime_ns:
+            return dict(cached[1])
+
+        # Only the two remote URLs are needed, so parse .git/config
+        # directly instead of building a full Repo object (which walks
+        # refs and resolves HEAD just to get instantiated). strict=False
+        # tolerates duplicate keys (e.g. multiple fetch = lines) and
+        # interpolation=None keeps % in URLs from raising
+        cfg = configparser.ConfigParser(strict=False, interpolation=None)
+        cfg.read(config_path)
+
+        origin_url = cfg.get('remote "origin"', 'url', fallback="")
+        if origin_url:
             result["origin"] = origin_url
-            
+
             # Check if it looks like a fork
-            if re.search(r"-fork", origin_url, re.IGNORECASE):
+            if _FORK_CHECK_RE.search(origin_url):
                 result["is_fork"] = True
                 result["inferred_upstream"] = infer_upstream_url(origin_url)
-        except (AttributeError, ValueError):
-            pass # No origin remote
-            
-        # Get Upstream if exists
-        try:
-            upstream_url = repo.remotes.upstream.url
-            result["current_upstream"] = upstream_url
-        except (AttributeError, ValueError):
-            pass # No upstream remote
-            
+
+        result["current_upstream"] = cfg.get('remote "upstream"', 'url', fallback="")
+
+        _REMOTE_CACHE[repo_path] = (mtime_ns, dict(result))
+
     except Exception:
         pass
-        
+
     return result
@@ -1,12 +1,34 @@
+import os
+import re
+import json
 from typing import Tuple
 
+try:
+    # C JSON codec for the project.json rewrite; optional
+    import orjson
+except ImportError:
+    orjson = None
+
+# Targeted edit for the common case of bumping projectVersion without
+# re-serializing the whole file
+_PROJECT_VERSION_RE = re.compile(r'("projectVersion"\s*:\s*")([^"]*)(")')
+
+
+def _write_bytes_atomic(path: str, buf: bytes) -> None:
+    """Write buf to path via tmp file + fsync + rename (crash-safe)."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(buf)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
 def parse_version(version: str) -> Tuple[int, int, int]:
     """Parse semantic version string (X.Y.Z) into a tuple of integers."""
-    parts = version.split(".")
-    major = int(parts[0]) if len(parts) > 0 else 0
-    minor = int(parts[1]) if len(parts) > 1 else 0
-    patch = int(parts[2]) if len(parts) > 2 else 0
-    return (major, minor, patch)
+    # Padding with "0" replaces the three len() checks; extra components
+    # (e.g. "22.10.4.1") land in the discarded remainder
+    major, minor, patch, *_ = (*version.split("."), "0", "0", "0")
+    return (int(major or 0), int(minor or 0), int(patch or 0))
 
 def increment_version(version: str, bump: str = "patch") -> str:
     """
@@ -40,28 +62,47 @@ def update_project_json_version(project_path: str, new_version: str) -> Tuple[bo
     Returns:
         Tuple of (success, message)
     """
-    import os
-    import json
-    
     project_json_path = os.path.join(project_path, "project.json")
     
     if not os.path.exists(project_json_path):
         return False, f"project.json não encontrado em: {project_path}"
     
     try:
-        # Read existing project.json
         with open(project_json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
+            text = f.read()
+
+        # Fast path: substitute the version string in the raw text,
+        # preserving the author's formatting and key order
+        old_version = "Unknown"
+
+        def _swap(m: "re.Match") -> str:
+            nonlocal old_version
+            old_version = m.group(2)
+            return m.group(1) + new_version + m.group(3)
+
+        new_text, n = _PROJECT_VERSION_RE.subn(_swap, text, count=1)
+
+        if n == 1:
+            _write_bytes_atomic(project_json_path, new_text.encode('utf-8'))
+            return True, f"Versão atualizada: {old_version} → {new_version}"
+
+        # No projectVersion key in the text — fall back to full
+        # parse + re-dump so the key gets created
+        if orjson is not None:
+            data = orjson.loads(text)
+        else:
+            data = json.loads(text)
+
         old_version = data.get("projectVersion", "Unknown")
-        
-        # Update version
         data["projectVersion"] = new_version
-        
-        # Write back with same formatting
-        with open(project_json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
+
+        if orjson is not None:
+            buf = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            buf = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+        _write_bytes_atomic(project_json_path, buf)
+
         return True, f"Versão atualizada: {old_version} → {new_version}"
         
     except json.JSONDecodeError as e: